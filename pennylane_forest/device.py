@@ -31,6 +31,8 @@ Code details
 """
 import uuid
 
+from functools import lru_cache
+
 import numpy as np
 
 from collections import OrderedDict
@@ -54,6 +56,22 @@ from ._version import __version__
 pyquil_config = PyquilConfig()
 
 
+@lru_cache()
+def _basis_state_weights(num_wires):
+    """Powers of two used to collapse sampled bits into basis-state indices.
+
+    The weight vector only depends on the number of wires, so it is cached
+    across the repeated probability estimations of a gradient loop.
+
+    Args:
+        num_wires (int): number of measured wires
+
+    Returns:
+        array[int]: the vector ``[2^(n-1), ..., 2, 1]``
+    """
+    return 1 << np.arange(num_wires - 1, -1, -1, dtype=np.int64)
+
+
 def basis_state(par, *wires):
     """Decompose a basis state into a list of PauliX matrices.
 
@@ -339,6 +357,122 @@ class ForestDevice(QubitDevice):
 
         return np.reshape(state_multi_index, 2 ** self.num_wires)
 
+    @property
+    def _samples(self):
+        """array[int]: the computational basis samples of the last device execution"""
+        return self.__samples
+
+    @_samples.setter
+    def _samples(self, value):
+        # a new shot batch invalidates the memoized probability histograms
+        self.__samples = value
+        self._prob_cache = {}
+
+    def sample_basis_states(self, number_of_states, state_probability):
+        """Sample from the computational basis states based on the state
+        probability.
+
+        This reimplements :meth:`pennylane.QubitDevice.sample_basis_states` for the
+        high-shot/low-qubit regime: when the number of shots is at least the number
+        of basis states, the occurrences of all basis states are drawn in a single
+        multinomial draw (NumPy implements the conditional-binomial method, which is
+        :math:`O(2^n)`) instead of ``shots`` independent draws.
+
+        Args:
+            number_of_states (int): the number of basis states to sample from
+            state_probability (array[float]): the computational basis probability vector
+
+        Returns:
+            array[int]: the sampled basis states
+        """
+        if self.shots is not None and self.shots >= number_of_states:
+            counts = np.random.multinomial(self.shots, state_probability)
+            samples = np.repeat(np.arange(number_of_states), counts)
+
+            # restore the exchangeability of the shots, so that splitting the
+            # samples into shot bins remains valid
+            np.random.shuffle(samples)
+            return samples
+
+        return super().sample_basis_states(number_of_states, state_probability)
+
+    def estimate_probability(self, wires=None, shot_range=None, bin_size=None):
+        """Return the estimated probability of each computational basis state
+        using the generated samples.
+
+        This reimplements :meth:`pennylane.QubitDevice.estimate_probability` with a
+        fully vectorized reduction: the sampled bits are collapsed to basis-state
+        indices with a single matrix-vector product, and the histogram is built
+        with ``np.bincount`` instead of a sort-based tally.
+
+        Args:
+            wires (Iterable[Number, str], Number, str, Wires): wires to calculate
+                marginal probabilities for. Wires not provided are traced out of the system.
+            shot_range (tuple[int]): 2-tuple of integers specifying the range of samples
+                to use. If not specified, all samples are used.
+            bin_size (int): Divides the shot range into bins of size ``bin_size``, and
+                returns the measurement statistic separately over each bin. If not
+                provided, the entire shot range is treated as a single bin.
+
+        Returns:
+            array[float]: list of the probabilities
+        """
+        wires = wires or self.wires
+        # convert to a wires object
+        wires = Wires(wires)
+        # translate to wire labels used by device
+        device_wires = self.map_wires(wires)
+
+        # repeated measurement statistics on the same wires share one histogram;
+        # the cache is invalidated whenever a new shot batch is generated
+        cache_key = (
+            tuple(device_wires.labels),
+            None if shot_range is None else tuple(shot_range),
+            bin_size,
+        )
+        if cache_key in self._prob_cache:
+            return self._prob_cache[cache_key]
+
+        sample_slice = Ellipsis if shot_range is None else slice(*shot_range)
+
+        num_wires = len(device_wires)
+        dim = 2 ** num_wires
+
+        if num_wires <= 8:
+            # fast path: fold the wire columns into the basis-state index with
+            # shift-accumulate passes on a byte-wide buffer, avoiding the
+            # [shots, num_wires] gather and the matrix-vector product below
+            labels = device_wires.labels
+            indices = np.asarray(self._samples[sample_slice, labels[0]], dtype=np.uint8)
+            for label in labels[1:]:
+                indices = (indices << 1) | np.asarray(
+                    self._samples[sample_slice, label], dtype=np.uint8
+                )
+            num_samples = indices.shape[0]
+        else:
+            samples = self._samples[sample_slice, device_wires]
+
+            # convert samples from a list of 0, 1 integers, to base 10 representation
+            # in a single matrix-vector product
+            indices = np.asarray(samples @ _basis_state_weights(num_wires), dtype=np.int64)
+            num_samples = len(samples)
+
+        # count the basis state occurrences, and construct the probability vector
+        if bin_size is not None:
+            bins = num_samples // bin_size
+
+            # offset the indices of each bin into a disjoint range, so that a
+            # single bincount call histograms all bins at once
+            indices = indices.reshape((bins, -1)) + dim * np.arange(bins)[:, np.newaxis]
+            counts = np.bincount(indices.ravel(), minlength=dim * bins)
+            prob = counts.reshape((bins, dim)).T / bin_size
+        else:
+            prob = np.bincount(indices, minlength=dim) / num_samples
+
+        prob = self._asarray(prob, dtype=self.R_DTYPE)
+        self._prob_cache[cache_key] = prob
+        return prob
+
     def analytic_probability(self, wires=None):
         """Return the (marginal) probability of each computational basis
         state from the last run of the device.
@@ -114,12 +114,19 @@ class QPUDevice(QVMDevice):
 
         self.readout_error = readout_error
 
-        self._eigs = {}
-
         self._compiled_program = None
         """Union[None, pyquil.ExecutableDesignator]: the latest compiled program. If parametric
         compilation is turned on, this will be a parametric program."""
 
+        self._compiled_program_cache = {}
+        """dict[str, pyquil.ExecutableDesignator]: stores the Quil program text associated
+            with the corresponding compiled program, used when no circuit hash is available
+            for parametric compilation."""
+
+        self._measurement_programs = {}
+        """dict[tuple, pyquil.Program]: stores the measurement postfix programs
+            associated with the measured qubits."""
+
         if kwargs.get("parametric_compilation", False):
             # Raise a warning if parametric compilation was explicitly turned on by the user
             # about turning the operator estimation off
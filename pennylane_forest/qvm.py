@@ -22,6 +22,7 @@ Code details
 import re
 
 import networkx as nx
+import numpy as np
 from pyquil import get_qc
 from pyquil.api._quantum_computer import _get_qvm_with_topology
 from pyquil.gates import MEASURE, RESET
@@ -90,6 +91,15 @@ class QVMDevice(ForestDevice):
         """Union[None, pyquil.ExecutableDesignator]: the latest compiled program. If parametric
         compilation is turned on, this will be a parametric program."""
 
+        self._compiled_program_cache = {}
+        """dict[str, pyquil.ExecutableDesignator]: stores the Quil program text associated
+            with the corresponding compiled program, used when no circuit hash is available
+            for parametric compilation."""
+
+        self._measurement_programs = {}
+        """dict[tuple, pyquil.Program]: stores the measurement postfix programs
+            associated with the measured qubits."""
+
         self.parametric_compilation = kwargs.get("parametric_compilation", True)
 
         if self.parametric_compilation:
@@ -173,12 +183,35 @@ class QVMDevice(ForestDevice):
         self.prog = prag + self.prog
 
         qubits = sorted(self.wiring.values())
-        ro = self.prog.declare("ro", "BIT", len(qubits))
-        for i, q in enumerate(qubits):
-            self.prog.inst(MEASURE(q, ro[i]))
+        self.prog += self._measurement_program(qubits)
 
         self.prog.wrap_in_numshots_loop(self.shots)
 
+    def _measurement_program(self, qubits):
+        """Return the measurement postfix for the given qubits.
+
+        The postfix (the classical register declaration plus one ``MEASURE`` per
+        qubit) is identical for every circuit run on the device, so it is only
+        built once per qubit layout and reused afterwards.
+
+        Args:
+            qubits (list[int]): the device qubits to measure
+
+        Returns:
+            pyquil.Program: program measuring each qubit into the ``ro`` register
+        """
+        key = tuple(qubits)
+
+        if key not in self._measurement_programs:
+            prog = Program()
+            ro = prog.declare("ro", "BIT", len(qubits))
+            for i, q in enumerate(qubits):
+                prog.inst(MEASURE(q, ro[i]))
+
+            self._measurement_programs[key] = prog
+
+        return self._measurement_programs[key]
+
     def apply_parametric_program(self, operations, **kwargs):
         """Applies a parametric program by applying parametric
         operation with symbolic parameters.
@@ -229,13 +262,19 @@ class QVMDevice(ForestDevice):
 
     def generate_samples(self):
         if "pyqvm" in self.qc.name:
-            return self.qc.run(self.prog, memory_map=self._parameter_map)
+            return self._compact_samples(self.qc.run(self.prog, memory_map=self._parameter_map))
 
         if self.circuit_hash is None:
-            # Parametric compilation was set to False
-            # Compile the program
-            self._compiled_program = self.qc.compile(self.prog)
-            return self.qc.run(executable=self._compiled_program)
+            # Parametric compilation was set to False. Compilation is a pure function
+            # of the program text, so the compiled executable is still memoized in
+            # order to skip the compiler round-trip when re-running the same circuit.
+            program_text = self.prog.out()
+
+            if program_text not in self._compiled_program_cache:
+                self._compiled_program_cache[program_text] = self.qc.compile(self.prog)
+
+            self._compiled_program = self._compiled_program_cache[program_text]
+            return self._compact_samples(self.qc.run(executable=self._compiled_program))
 
         if self.circuit_hash not in self._compiled_program_dict:
             # Compiling this specific program for the first time
@@ -245,7 +284,29 @@ class QVMDevice(ForestDevice):
         # The program has been compiled, store as the latest compiled program
         self._compiled_program = self._compiled_program_dict[self.circuit_hash]
         samples = self.qc.run(executable=self._compiled_program, memory_map=self._parameter_map)
-        return samples
+        return self._compact_samples(samples)
+
+    @staticmethod
+    def _compact_samples(samples):
+        """Convert the raw shot table returned by the QVM into a contiguous
+        ``np.int8`` array.
+
+        The measured bits only take the values 0 and 1, so the narrow dtype cuts
+        the memory held by a shot batch by 8x compared to the default integer
+        arrays returned by pyQuil, while keeping the ``[shots, num_wires]`` layout
+        expected by ``QubitDevice``.
+
+        Args:
+            samples (Union[None, array[int]]): the raw samples returned by the QVM
+
+        Returns:
+            Union[None, array[int]]: the samples as a C-contiguous ``np.int8`` array
+        """
+        if samples is None:
+            # nothing was returned by the run; pass it through unchanged
+            return samples
+
+        return np.ascontiguousarray(samples, dtype=np.int8)
 
     @property
     def circuit_hash(self):
@@ -272,8 +333,9 @@ class QVMDevice(ForestDevice):
         """Resets the device after the previous run.
 
         Note:
-            The ``_compiled_program`` and the ``_compiled_program_dict`` attributes are
-            not reset such that these can be used upon multiple device execution.
+            The ``_compiled_program``, ``_compiled_program_dict`` and
+            ``_compiled_program_cache`` attributes are not reset such that these can
+            be used upon multiple device execution.
         """
         super().reset()
 
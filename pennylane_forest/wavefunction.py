@@ -29,7 +29,6 @@ Code details
 import itertools
 
 import numpy as np
-from numpy.linalg import eigh
 from pennylane.wires import Wires
 
 from pyquil.api import WavefunctionSimulator
@@ -15,11 +15,18 @@ from pyquil.api._config import PyquilConfig
 from pyquil.api._errors import UnknownApiError
 from pyquil.api._qvm import QVMNotRunning
 
+import pennylane_forest as plf
+
 
 # defaults
 TOLERANCE = 1e-5
 QVM_SHOTS = 10000
 
+# QVM lattices standing in for QPU devices in the QPU-flavoured tests. Shared
+# here so the list is defined (and, if it ever queries Forest services again,
+# evaluated) only once per test process.
+TEST_QPU_LATTICES = ["4q-qvm"]
+
 
 # pyquil specific global variables and functions
 I = np.identity(2)
@@ -108,15 +115,98 @@ def tol(request):
         return TOLERANCE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def shots():
     """default shots"""
     return QVM_SHOTS
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def qvm_device_2q(shots):
+    """Session-scoped two-qubit QVM device.
+
+    Instantiating a QVMDevice opens fresh compiler and QVM connections, which
+    dominates the wall-clock of the unit tests; sharing one instance across the
+    session amortizes that cost. Tests calling this fixture are responsible for
+    calling ``reset()`` before applying their circuit.
+    """
+    return plf.QVMDevice(device="2q-qvm", shots=shots)
+
+
+@pytest.fixture(scope="session")
+def qvm_device_3q(shots):
+    """Session-scoped three-qubit QVM device with parametric compilation turned
+    off, shared by the gate-application tests. As for ``qvm_device_2q``, consumers
+    must call ``reset()`` before applying their circuit."""
+    return plf.QVMDevice(device="3q-qvm", shots=shots, parametric_compilation=False)
+
+
+def assert_samples_on_eigvals(samples, eigvals, tol):
+    """Assert that every sample equals one of ``eigvals`` within ``tol``, and
+    that every eigenvalue appears among the samples.
+
+    Each sample is matched to its nearest eigenvalue by binary search on the
+    sorted spectrum, so no per-element Python comparison is needed.
+    """
+    eigvals = np.sort(eigvals)
+
+    # nearest eigenvalue for every sample
+    nearest = np.clip(np.searchsorted(eigvals, samples), 1, eigvals.size - 1)
+    nearest -= np.abs(samples - eigvals[nearest - 1]) < np.abs(samples - eigvals[nearest])
+
+    assert np.allclose(samples, eigvals[nearest], atol=tol, rtol=0)
+    assert np.array_equal(np.unique(nearest), np.arange(eigvals.size))
+
+
+def sample_until_converged(dev, observable, atol, check_variance=False, max_shots=20 * QVM_SHOTS):
+    """Accumulate batches of ``dev.shots`` samples of an observable until the
+    statistics under test have converged.
+
+    Batches are drawn until the standard error of the sample mean (and, when
+    ``check_variance`` is set, of the sample variance) falls below ``atol / 3``,
+    or until ``max_shots`` samples have been taken. The circuit must already
+    have been applied on the device; each batch re-runs it through
+    ``generate_samples``.
+
+    Args:
+        dev (ForestDevice): device to sample from
+        observable: observable passed on to ``dev.sample``
+        atol (float): absolute tolerance the caller asserts with
+        check_variance (bool): also require the sample variance to converge
+        max_shots (int): hard cap on the total number of samples
+
+    Returns:
+        array[float]: the concatenated samples from all batches
+    """
+    batches = []
+    num_samples = 0
+
+    while True:
+        dev._samples = dev.generate_samples()
+        batches.append(dev.sample(observable))
+        num_samples += batches[-1].size
+
+        samples = np.concatenate(batches)
+        centered = samples - samples.mean()
+        var = np.mean(centered ** 2)
+
+        sem = np.sqrt(var / num_samples)
+        if check_variance:
+            sem = max(sem, np.sqrt((np.mean(centered ** 4) - var ** 2) / num_samples))
+
+        if sem < atol / 3 or num_samples >= max_shots:
+            return samples
+
+
+@pytest.fixture(scope="session")
 def apply_unitary():
-    """Apply a unitary operation to the ground state."""
+    """Apply a unitary operation to the ground state.
+
+    The gate-application tests call this with the same handful of constant
+    matrices once per parametrization, so the results are memoized for the
+    session.
+    """
+    cache = {}
 
     def _apply_unitary(mat, num_wires):
         """Applies a unitary to the first wire of a register in the ground state
@@ -125,16 +215,22 @@ def apply_unitary():
             mat (array): unitary matrix
             num_wires (n): number of wires in the register
         """
-        N = mat.shape[0]
+        mat = np.asarray(mat)
+        key = (mat.tobytes(), num_wires)
+
+        if key not in cache:
+            N = mat.shape[0]
+
+            init_state = np.zeros(N)
+            init_state[0] = 1
+            result = mat @ init_state
 
-        init_state = np.zeros(N)
-        init_state[0] = 1
-        result = mat @ init_state
+            for _ in range(num_wires - int(np.log2(N))):
+                result = np.kron(result, np.array([1, 0]))
 
-        for _ in range(num_wires - int(np.log2(N))):
-            result = np.kron(result, np.array([1, 0]))
+            cache[key] = result
 
-        return result
+        return cache[key]
 
     return _apply_unitary
 
@@ -188,18 +284,12 @@ class BaseTest:
         """
         if isinstance(first, tuple):
             # check each element of the tuple separately (needed for when the tuple elements are themselves batches)
-            if np.all([np.all(first[idx] == second[idx]) for idx, _ in enumerate(first)]):
-                return
-            if np.all(
-                [np.all(np.abs(first[idx] - second[idx])) <= delta for idx, _ in enumerate(first)]
-            ):
-                return
+            for first_element, second_element in zip(first, second):
+                np.testing.assert_allclose(
+                    np.asarray(first_element), np.asarray(second_element), atol=delta, rtol=0
+                )
         else:
-            if np.all(first == second):
-                return
-            if np.all(np.abs(first - second) <= delta):
-                return
-        assert False, "{} != {} within {} delta".format(first, second, delta)
+            np.testing.assert_allclose(np.asarray(first), np.asarray(second), atol=delta, rtol=0)
 
     def assertAllEqual(self, first, second):
         """
@@ -110,6 +110,86 @@ class TestMatVecProduct:
 
         assert np.allclose(res, expected, atol=tol, rtol=0)
 
+    def test_sample_basis_states(self, tol):
+        """Test that the multinomial fast path of sample_basis_states draws
+        samples with the correct support and frequencies"""
+        wires = 2
+        dev = ForestDevice(wires=wires, shots=10000)
+
+        probs = np.array([0.5, 0.5, 0, 0])
+        samples = dev.sample_basis_states(4, probs)
+
+        assert samples.shape == (10000,)
+        assert set(samples).issubset({0, 1})
+        assert np.allclose(np.mean(samples), 0.5, atol=3 / np.sqrt(10000), rtol=0)
+
+    def test_sample_basis_states_few_shots(self, tol):
+        """Test that sample_basis_states falls back to per-shot sampling when
+        there are fewer shots than basis states"""
+        wires = 3
+        dev = ForestDevice(wires=wires, shots=2)
+
+        probs = np.zeros(8)
+        probs[3] = 1
+
+        samples = dev.sample_basis_states(8, probs)
+        assert np.all(samples == 3)
+
+    def test_estimate_probability(self, tol):
+        """Test that the vectorized probability estimation agrees with a
+        direct tally of the generated samples"""
+        wires = 2
+        dev = ForestDevice(wires=wires, shots=4)
+
+        dev._samples = np.array([[0, 0], [1, 1], [1, 0], [1, 1]])
+
+        res = dev.estimate_probability()
+        expected = np.array([0.25, 0, 0.25, 0.5])
+
+        assert np.allclose(res, expected, atol=tol, rtol=0)
+
+    def test_estimate_probability_marginal(self, tol):
+        """Test that probability estimation returns the correct marginal
+        probabilities for a subset of wires"""
+        wires = 2
+        dev = ForestDevice(wires=wires, shots=4)
+
+        dev._samples = np.array([[0, 0], [1, 1], [1, 0], [1, 1]])
+
+        res = dev.estimate_probability(wires=[1])
+        expected = np.array([0.5, 0.5])
+
+        assert np.allclose(res, expected, atol=tol, rtol=0)
+
+    def test_estimate_probability_cached_per_shot_batch(self, tol):
+        """Test that repeated probability estimations on the same wires reuse
+        the memoized histogram, and that a new shot batch invalidates it"""
+        wires = 1
+        dev = ForestDevice(wires=wires, shots=4)
+
+        dev._samples = np.array([[0], [1], [1], [1]])
+        res = dev.estimate_probability(wires=[0])
+        assert dev.estimate_probability(wires=[0]) is res
+
+        # assigning a new shot batch clears the cache
+        dev._samples = np.array([[0], [0], [0], [1]])
+        assert np.allclose(
+            dev.estimate_probability(wires=[0]), np.array([0.75, 0.25]), atol=tol, rtol=0
+        )
+
+    def test_estimate_probability_binned(self, tol):
+        """Test that probability estimation returns the per-bin probabilities
+        when a bin size is specified"""
+        wires = 1
+        dev = ForestDevice(wires=wires, shots=4)
+
+        dev._samples = np.array([[0], [1], [1], [1]])
+
+        res = dev.estimate_probability(wires=[0], bin_size=2)
+        expected = np.array([[0.5, 0], [0.5, 1]])
+
+        assert np.allclose(res, expected, atol=tol, rtol=0)
+
     def test_apply_basis_state_raises_an_error_if_not_first(self):
         """Test that there is an error raised when the BasisState is not
         applied as the first operation."""
@@ -8,7 +8,7 @@ import pytest
 import pennylane as qml
 from pennylane import numpy as np
 
-from conftest import BaseTest
+from conftest import BaseTest, assert_samples_on_eigvals
 from conftest import I, U, U2, SWAP, CNOT, U_toffoli, H, test_operation_map
 
 import pennylane_forest as plf
@@ -181,7 +181,7 @@ class TestWavefunctionBasic(BaseTest):
         # s1 should only contain the eigenvalues of
         # the hermitian matrix
         eigvals = np.linalg.eigvalsh(A)
-        assert np.allclose(sorted(list(set(s1))), sorted(eigvals), atol=tol, rtol=0)
+        assert np.allclose(np.unique(s1), np.sort(eigvals), atol=tol, rtol=0)
 
         # the analytic mean is 2*sin(theta)+0.5*cos(theta)+0.5
         assert np.allclose(
@@ -225,8 +225,7 @@ class TestWavefunctionBasic(BaseTest):
 
         # s1 should only contain the eigenvalues of
         # the hermitian matrix
-        eigvals = np.linalg.eigvalsh(A)
-        assert np.allclose(sorted(list(set(s1))), sorted(eigvals), atol=tol, rtol=0)
+        assert_samples_on_eigvals(s1, np.linalg.eigvalsh(A), tol)
 
         # make sure the mean matches the analytic mean
         expected = (
@@ -12,14 +12,12 @@ from pennylane import numpy as np
 from pennylane.operation import Tensor
 from pennylane.wires import Wires
 import pennylane_forest as plf
-from conftest import BaseTest, QVM_SHOTS
+from conftest import BaseTest, QVM_SHOTS, TEST_QPU_LATTICES
 
 from flaky import flaky
 
 log = logging.getLogger(__name__)
 
-TEST_QPU_LATTICES = ["4q-qvm"]
-
 
 @pytest.mark.xfail
 class TestQPUIntegration(BaseTest):
@@ -18,7 +18,8 @@ from pyquil.quil import Pragma, Program
 from pyquil.api._quantum_computer import QuantumComputer
 
 from conftest import BaseTest
-from conftest import I, Z, H, U, U2, test_operation_map, QVM_SHOTS
+from conftest import I, Z, H, U, U2, test_operation_map, QVM_SHOTS, TEST_QPU_LATTICES
+from conftest import assert_samples_on_eigvals, sample_until_converged
 
 import pennylane_forest as plf
 
@@ -28,7 +29,48 @@ from flaky import flaky
 
 log = logging.getLogger(__name__)
 
-TEST_QPU_LATTICES = ["4q-qvm"]
+# rotation angles shared by the expectation-value tests below, together with
+# the analytic expectation values of the corresponding two-qubit circuits
+THETA = 0.432
+PHI = 0.123
+
+EXPECTED_PAULIZ = np.array([np.cos(THETA), np.cos(THETA) * np.cos(PHI)])
+EXPECTED_PAULIX = np.array([np.sin(THETA) * np.sin(PHI), np.sin(PHI)])
+EXPECTED_PAULIY = np.array([0, -np.cos(THETA) * np.sin(PHI)])
+EXPECTED_HADAMARD = np.array(
+    [np.sin(THETA) * np.sin(PHI) + np.cos(THETA), np.cos(THETA) * np.cos(PHI) + np.sin(PHI)]
+) / np.sqrt(2)
+_a = H[0, 0].real
+_re_b = H[0, 1].real
+_d = H[1, 1].real
+EXPECTED_HERMITIAN = np.array(
+    [
+        ((_a - _d) * np.cos(THETA) + 2 * _re_b * np.sin(THETA) * np.sin(PHI) + _a + _d) / 2,
+        ((_a - _d) * np.cos(THETA) * np.cos(PHI) + 2 * _re_b * np.sin(PHI) + _a + _d) / 2,
+    ]
+)
+EXPECTED_MULTI_QUBIT_HERMITIAN = 0.5 * (
+    6 * np.cos(THETA) * np.sin(PHI)
+    - np.sin(THETA) * (8 * np.sin(PHI) + 7 * np.cos(PHI) + 3)
+    - 2 * np.sin(PHI)
+    - 6 * np.cos(PHI)
+    - 6
+)
+
+# PauliZ on the first of three wires, measured by test_apply
+Z_KRON_I_I = np.kron(np.kron(Z, I), I)
+
+# Hermitian observable sampled in test_sample_values_hermitian_multi_qubit,
+# with its spectrum precomputed once
+A_SAMPLE = np.array(
+    [
+        [1, 2j, 1 - 2j, 0.5j],
+        [-2j, 0, 3 + 4j, 1],
+        [1 + 2j, 3 - 4j, 0.75, 1.5 - 2j],
+        [-0.5j, 1, 1.5 + 2j, -1],
+    ]
+)
+A_SAMPLE_EIGVALS = np.linalg.eigvalsh(A_SAMPLE)
 
 
 compiled_program = (
@@ -47,16 +89,14 @@ class TestQVMBasic(BaseTest):
 
     # pylint: disable=protected-access
 
-    def test_identity_expectation(self, shots, qvm, compiler):
+    def test_identity_expectation(self, shots, qvm, compiler, qvm_device_2q):
         """Test that identity expectation value (i.e. the trace) is 1"""
-        theta = 0.432
-        phi = 0.123
-
-        dev = plf.QVMDevice(device="2q-qvm", shots=shots)
+        dev = qvm_device_2q
+        dev.reset()
 
         with qml.tape.QuantumTape() as tape:
-            qml.RX(theta, wires=[0])
-            qml.RX(phi, wires=[1])
+            qml.RX(THETA, wires=[0])
+            qml.RX(PHI, wires=[1])
             qml.CNOT(wires=[0, 1])
             O1 = qml.expval(qml.Identity(wires=[0]))
             O2 = qml.expval(qml.Identity(wires=[1]))
@@ -70,16 +110,14 @@ class TestQVMBasic(BaseTest):
         # below are the analytic expectation values for this circuit (trace should always be 1)
         self.assertAllAlmostEqual(res, np.array([1, 1]), delta=3 / np.sqrt(shots))
 
-    def test_pauliz_expectation(self, shots, qvm, compiler):
+    def test_pauliz_expectation(self, shots, qvm, compiler, qvm_device_2q):
         """Test that PauliZ expectation value is correct"""
-        theta = 0.432
-        phi = 0.123
-
-        dev = plf.QVMDevice(device="2q-qvm", shots=shots)
+        dev = qvm_device_2q
+        dev.reset()
 
         with qml.tape.QuantumTape() as tape:
-            qml.RX(theta, wires=[0])
-            qml.RX(phi, wires=[1])
+            qml.RX(THETA, wires=[0])
+            qml.RX(PHI, wires=[1])
             qml.CNOT(wires=[0, 1])
             O1 = qml.expval(qml.PauliZ(wires=[0]))
             O2 = qml.expval(qml.PauliZ(wires=[1]))
@@ -90,20 +128,16 @@ class TestQVMBasic(BaseTest):
         res = np.array([dev.expval(O1), dev.expval(O2)])
 
         # below are the analytic expectation values for this circuit
-        self.assertAllAlmostEqual(
-            res, np.array([np.cos(theta), np.cos(theta) * np.cos(phi)]), delta=3 / np.sqrt(shots)
-        )
+        self.assertAllAlmostEqual(res, EXPECTED_PAULIZ, delta=3 / np.sqrt(shots))
 
-    def test_paulix_expectation(self, shots, qvm, compiler):
+    def test_paulix_expectation(self, shots, qvm, compiler, qvm_device_2q):
         """Test that PauliX expectation value is correct"""
-        theta = 0.432
-        phi = 0.123
-
-        dev = plf.QVMDevice(device="2q-qvm", shots=shots)
+        dev = qvm_device_2q
+        dev.reset()
 
         with qml.tape.QuantumTape() as tape:
-            qml.RY(theta, wires=[0])
-            qml.RY(phi, wires=[1])
+            qml.RY(THETA, wires=[0])
+            qml.RY(PHI, wires=[1])
             qml.CNOT(wires=[0, 1])
             O1 = qml.expval(qml.PauliX(wires=[0]))
             O2 = qml.expval(qml.PauliX(wires=[1]))
@@ -113,20 +147,16 @@ class TestQVMBasic(BaseTest):
 
         res = np.array([dev.expval(O1), dev.expval(O2)])
         # below are the analytic expectation values for this circuit
-        self.assertAllAlmostEqual(
-            res, np.array([np.sin(theta) * np.sin(phi), np.sin(phi)]), delta=3 / np.sqrt(shots)
-        )
+        self.assertAllAlmostEqual(res, EXPECTED_PAULIX, delta=3 / np.sqrt(shots))
 
-    def test_pauliy_expectation(self, shots, qvm, compiler):
+    def test_pauliy_expectation(self, shots, qvm, compiler, qvm_device_2q):
         """Test that PauliY expectation value is correct"""
-        theta = 0.432
-        phi = 0.123
-
-        dev = plf.QVMDevice(device="2q-qvm", shots=shots)
+        dev = qvm_device_2q
+        dev.reset()
 
         with qml.tape.QuantumTape() as tape:
-            qml.RX(theta, wires=[0])
-            qml.RX(phi, wires=[1])
+            qml.RX(THETA, wires=[0])
+            qml.RX(PHI, wires=[1])
             qml.CNOT(wires=[0, 1])
             O1 = qml.expval(qml.PauliY(wires=[0]))
             O2 = qml.expval(qml.PauliY(wires=[1]))
@@ -137,20 +167,16 @@ class TestQVMBasic(BaseTest):
         res = np.array([dev.expval(O1), dev.expval(O2)])
 
         # below are the analytic expectation values for this circuit
-        self.assertAllAlmostEqual(
-            res, np.array([0, -np.cos(theta) * np.sin(phi)]), delta=3 / np.sqrt(shots)
-        )
+        self.assertAllAlmostEqual(res, EXPECTED_PAULIY, delta=3 / np.sqrt(shots))
 
-    def test_hadamard_expectation(self, shots, qvm, compiler):
+    def test_hadamard_expectation(self, shots, qvm, compiler, qvm_device_2q):
         """Test that Hadamard expectation value is correct"""
-        theta = 0.432
-        phi = 0.123
-
-        dev = plf.QVMDevice(device="2q-qvm", shots=shots)
+        dev = qvm_device_2q
+        dev.reset()
 
         with qml.tape.QuantumTape() as tape:
-            qml.RY(theta, wires=[0])
-            qml.RY(phi, wires=[1])
+            qml.RY(THETA, wires=[0])
+            qml.RY(PHI, wires=[1])
             qml.CNOT(wires=[0, 1])
             O1 = qml.expval(qml.Hadamard(wires=[0]))
             O2 = qml.expval(qml.Hadamard(wires=[1]))
@@ -161,26 +187,21 @@ class TestQVMBasic(BaseTest):
         res = np.array([dev.expval(O1), dev.expval(O2)])
 
         # below are the analytic expectation values for this circuit
-        expected = np.array(
-            [np.sin(theta) * np.sin(phi) + np.cos(theta), np.cos(theta) * np.cos(phi) + np.sin(phi)]
-        ) / np.sqrt(2)
-        self.assertAllAlmostEqual(res, expected, delta=3 / np.sqrt(shots))
+        self.assertAllAlmostEqual(res, EXPECTED_HADAMARD, delta=3 / np.sqrt(shots))
 
     @flaky(max_runs=10, min_passes=3)
-    def test_hermitian_expectation(self, shots, qvm, compiler):
+    def test_hermitian_expectation(self, shots, qvm, compiler, qvm_device_2q):
         """Test that arbitrary Hermitian expectation values are correct.
 
         As the results coming from the qvm are stochastic, a constraint of 3 out of 5 runs was added.
         """
 
-        theta = 0.432
-        phi = 0.123
-
-        dev = plf.QVMDevice(device="2q-qvm", shots=shots)
+        dev = qvm_device_2q
+        dev.reset()
 
         with qml.tape.QuantumTape() as tape:
-            qml.RY(theta, wires=[0])
-            qml.RY(phi, wires=[1])
+            qml.RY(THETA, wires=[0])
+            qml.RY(PHI, wires=[1])
             qml.CNOT(wires=[0, 1])
             O1 = qml.expval(qml.Hermitian(H, wires=[0]))
             O2 = qml.expval(qml.Hermitian(H, wires=[1]))
@@ -192,20 +213,10 @@ class TestQVMBasic(BaseTest):
 
         # below are the analytic expectation values for this circuit with arbitrary
         # Hermitian observable H
-        a = H[0, 0]
-        re_b = H[0, 1].real
-        d = H[1, 1]
-        ev1 = ((a - d) * np.cos(theta) + 2 * re_b * np.sin(theta) * np.sin(phi) + a + d) / 2
-        ev2 = ((a - d) * np.cos(theta) * np.cos(phi) + 2 * re_b * np.sin(phi) + a + d) / 2
-        expected = np.array([ev1, ev2])
-
-        self.assertAllAlmostEqual(res, expected, delta=4 / np.sqrt(shots))
+        self.assertAllAlmostEqual(res, EXPECTED_HERMITIAN, delta=4 / np.sqrt(shots))
 
     def test_multi_qubit_hermitian_expectation(self, shots, qvm, compiler):
         """Test that arbitrary multi-qubit Hermitian expectation values are correct"""
-        theta = 0.432
-        phi = 0.123
-
         A = np.array(
             [
                 [-6, 2 + 1j, -3, -5 + 2j],
@@ -218,8 +229,8 @@ class TestQVMBasic(BaseTest):
         dev = plf.QVMDevice(device="2q-qvm", shots=10 * shots)
 
         with qml.tape.QuantumTape() as tape:
-            qml.RY(theta, wires=[0])
-            qml.RY(phi, wires=[1])
+            qml.RY(THETA, wires=[0])
+            qml.RY(PHI, wires=[1])
             qml.CNOT(wires=[0, 1])
             O1 = qml.expval(qml.Hermitian(A, wires=[0, 1]))
 
@@ -229,19 +240,12 @@ class TestQVMBasic(BaseTest):
         res = np.array([dev.expval(O1)])
         # below is the analytic expectation value for this circuit with arbitrary
         # Hermitian observable A
-        expected = 0.5 * (
-            6 * np.cos(theta) * np.sin(phi)
-            - np.sin(theta) * (8 * np.sin(phi) + 7 * np.cos(phi) + 3)
-            - 2 * np.sin(phi)
-            - 6 * np.cos(phi)
-            - 6
-        )
-
-        self.assertAllAlmostEqual(res, expected, delta=5 / np.sqrt(shots))
+        self.assertAllAlmostEqual(res, EXPECTED_MULTI_QUBIT_HERMITIAN, delta=5 / np.sqrt(shots))
 
-    def test_var(self, shots, qvm, compiler):
+    def test_var(self, shots, qvm, compiler, qvm_device_2q):
         """Tests for variance calculation"""
-        dev = plf.QVMDevice(device="2q-qvm", shots=shots)
+        dev = qvm_device_2q
+        dev.reset()
 
         phi = 0.543
         theta = 0.6543
@@ -290,9 +294,10 @@ class TestQVMBasic(BaseTest):
     @pytest.mark.parametrize(
         "gate", plf.QVMDevice._operation_map
     )  # pylint: disable=protected-access
-    def test_apply(self, gate, apply_unitary, shots, qvm, compiler):
+    def test_apply(self, gate, apply_unitary, shots, qvm, compiler, qvm_device_3q):
         """Test the application of gates"""
-        dev = plf.QVMDevice(device="3q-qvm", shots=shots, parametric_compilation=False)
+        dev = qvm_device_3q
+        dev.reset()
 
         try:
             # get the equivalent pennylane operation class
@@ -348,7 +353,7 @@ class TestQVMBasic(BaseTest):
         dev._samples = dev.generate_samples()
 
         res = dev.expval(obs)
-        expected = np.vdot(state, np.kron(np.kron(Z, I), I) @ state)
+        expected = np.vdot(state, Z_KRON_I_I @ state)
 
         # verify the device is now in the expected state
         # Note we have increased the tolerance here, since we are only
@@ -380,10 +385,9 @@ class TestQVMBasic(BaseTest):
         the correct values
         """
         theta = 0.543
-        shots = 1_000_000
         A = np.array([[1, 2j], [-2j, 0]])
 
-        dev = plf.QVMDevice(device="1q-qvm", shots=shots)
+        dev = plf.QVMDevice(device="1q-qvm", shots=QVM_SHOTS)
 
         with qml.tape.QuantumTape() as tape:
             qml.RX(theta, wires=[0])
@@ -391,14 +395,14 @@ class TestQVMBasic(BaseTest):
 
         dev.apply(tape.operations, rotations=tape.diagonalizing_gates)
 
-        dev._samples = dev.generate_samples()
-
-        s1 = dev.sample(O1)
+        # both the mean and the variance are asserted below, so sample until
+        # the standard error of each drops below the assertion tolerance
+        s1 = sample_until_converged(dev, O1, atol=0.1, check_variance=True)
 
         # s1 should only contain the eigenvalues of
         # the hermitian matrix
         eigvals = np.linalg.eigvalsh(A)
-        assert np.allclose(sorted(list(set(s1))), sorted(eigvals), atol=tol, rtol=0)
+        assert np.allclose(np.unique(s1), np.sort(eigvals), atol=tol, rtol=0)
 
         # the analytic mean is 2*sin(theta)+0.5*cos(theta)+0.5
         assert np.allclose(
@@ -410,40 +414,30 @@ class TestQVMBasic(BaseTest):
             np.var(s1), 0.25 * (np.sin(theta) - 4 * np.cos(theta)) ** 2, atol=0.1, rtol=0
         )
 
-    def test_sample_values_hermitian_multi_qubit(self, qvm, tol):
+    def test_sample_values_hermitian_multi_qubit(self, qvm, tol, qvm_device_2q):
         """Tests if the samples of a multi-qubit Hermitian observable returned by sample have
         the correct values
         """
         theta = 0.543
-        shots = 100_000
-
-        A = np.array(
-            [
-                [1, 2j, 1 - 2j, 0.5j],
-                [-2j, 0, 3 + 4j, 1],
-                [1 + 2j, 3 - 4j, 0.75, 1.5 - 2j],
-                [-0.5j, 1, 1.5 + 2j, -1],
-            ]
-        )
 
-        dev = plf.QVMDevice(device="2q-qvm", shots=shots)
+        dev = qvm_device_2q
+        dev.reset()
 
         with qml.tape.QuantumTape() as tape:
             qml.RX(theta, wires=[0])
             qml.RY(2 * theta, wires=[1])
             qml.CNOT(wires=[0, 1])
-            O1 = qml.sample(qml.Hermitian(A, wires=[0, 1]))
+            O1 = qml.sample(qml.Hermitian(A_SAMPLE, wires=[0, 1]))
 
         dev.apply(tape.operations, rotations=tape.diagonalizing_gates)
 
-        dev._samples = dev.generate_samples()
-
-        s1 = dev.sample(O1)
+        # only the mean is asserted below, so sample until its standard
+        # error drops below the assertion tolerance
+        s1 = sample_until_converged(dev, O1, atol=0.1)
 
         # s1 should only contain the eigenvalues of
         # the hermitian matrix
-        eigvals = np.linalg.eigvalsh(A)
-        assert np.allclose(sorted(list(set(s1))), sorted(eigvals), atol=tol, rtol=0)
+        assert_samples_on_eigvals(s1, A_SAMPLE_EIGVALS, tol)
 
         # make sure the mean matches the analytic mean
         expected = (
@@ -617,6 +611,34 @@ class TestParametricCompilation(BaseTest):
         assert len(dev._compiled_program_dict.items()) == 0
         assert len(call_history) == 1
 
+    def test_compiled_program_was_stored_when_parametric_compilation_off(self, qvm, monkeypatch):
+        """Test that QVM device memoizes the compiled program on the Quil program
+        text when parametric compilation is turned off"""
+        dev = qml.device("forest.qvm", device="2q-qvm", parametric_compilation=False)
+        theta = 0.432
+        phi = 0.123
+
+        with qml.tape.QuantumTape() as tape:
+            qml.RX(theta, wires=[0])
+            qml.RX(phi, wires=[1])
+            qml.CNOT(wires=[0, 1])
+            O1 = qml.expval(qml.Identity(wires=[0]))
+            O2 = qml.expval(qml.Identity(wires=[1]))
+
+        dev.apply(tape.operations, rotations=tape.diagonalizing_gates)
+
+        call_history = []
+
+        for i in range(6):
+            with monkeypatch.context() as m:
+                m.setattr(QuantumComputer, "compile", lambda self, prog: call_history.append(prog))
+                m.setattr(QuantumComputer, "run", lambda self, **kwargs: None)
+                dev.generate_samples()
+
+        # The program text is unchanged between runs, so it was only compiled once
+        assert len(dev._compiled_program_cache.items()) == 1
+        assert len(call_history) == 1
+
     def test_parametric_compilation_with_numeric_and_symbolic_queue(self, monkeypatch):
         """Tests that a program containing numeric and symbolic variables as
         well is only compiled once."""